@@ -1,5 +1,6 @@
 
-import itertools
+import collections
+import heapq
 import logging
 
 import errors
@@ -8,7 +9,6 @@ import templating
 import utils
 
 import enum
-import networkx
 
 __all__ = (
     "new_workflow",
@@ -30,16 +30,91 @@ class _NODE_TYPE (enum.Enum):
     JOB = 0
     PATH = 1
 
-class _workflow:
+# types whose hash is derived from their value, so that equal values have
+# equal hashes; other values (e.g., instances hashed by identity) are all
+# given the same hash, and are told apart by a full comparison
+_VALUE_HASHED_TYPES = (basestring, int, long, float, bool, type(None))
+
+def _value_hash (value):
+    if (isinstance(value, _VALUE_HASHED_TYPES)):
+        return hash(value)
+
+    if (isinstance(value, tuple)):
+        return hash(tuple([_value_hash(item) for item in value]))
+
+    return 0
+
+class _slotted (object):
+    """ Base class of objects with slots; as these have no dictionary,
+        they can't be pickled with the default protocol unless they
+        provide their own state
+    """
+    __slots__ = ()
+
+    def __getstate__ (self):
+        return dict([(slot, getattr(self, slot)) for slot in self.__slots__])
+
+    def __setstate__ (self, state):
+        for slot, value in state.iteritems():
+            setattr(self, slot, value)
+
+class _job (_slotted):
+    """ Record of a job: its input and output paths, content, and
+        keyword arguments; slots spare a dictionary per instance
+    """
+    __slots__ = ("inputs", "outputs", "content", "kwargs")
+
+    def __init__ (self, inputs, outputs, content, kwargs):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.content = content
+        self.kwargs = kwargs
+
+class _workflow (_slotted):
     """ Simple representation of a file-based data processing workflow
     """
+    __slots__ = (
+        "_name", "_kwargs",
+        "_jobs", "_paths", "_producers", "_consumers",
+        "_chained_paths", "_in_degree",
+        "_version", "_jobs_order", "_fingerprint")
+
     def __init__ (self, name = None, **kwargs):
         if (name is None):
             name = utils.random_string()
 
-        self._graph = networkx.DiGraph(name = name)
+        self._name = name
         self._kwargs = kwargs
 
+        # the workflow is a bipartite graph of jobs and paths, stored as
+        # adjacency dictionaries: job records (in order of insertion) with
+        # their input and output paths, content, and keyword arguments;
+        # canonical instance of each path name so that a path shared by
+        # several jobs is stored only once; and for each path, the job
+        # producing it and the jobs consuming it, if any
+        self._jobs = collections.OrderedDict()
+        self._paths = {}
+        self._producers = {}
+        self._consumers = {}
+
+        # paths both produced and consumed by jobs; as long as there is
+        # none, jobs do not depend on each other and can run in any order
+        self._chained_paths = {}
+
+        # number of input paths of each job that are produced by other
+        # jobs; maintained as jobs are added or removed, so that sorting
+        # the jobs doesn't require walking all of their input paths
+        self._in_degree = {}
+
+        # counter incremented every time jobs or paths are added or
+        # removed; used to invalidate cached properties of the graph
+        self._version = 0
+        self._jobs_order = None
+
+        # fingerprint of the jobs, their paths, content and keyword
+        # arguments; reset every time any of these is modified
+        self._fingerprint = None
+
         logger.debug("created a new workflow with name '%s'" % name)
 
     def get_name (self):
@@ -55,7 +130,7 @@ class _workflow:
             [1] The name of a given workflow object can also be retrieved
                 by using the dedicated getter function 'name'
         """
-        return self._graph.graph["name"]
+        return self._name
 
     def set_name (self, name):
         """ Set the workflow name
@@ -70,25 +145,22 @@ class _workflow:
             [1] The name of a given workflow object can also be modified
                 by using the dedicated setter function 'name'
         """
-        self._graph.graph["name"] = name
-        logger.debug("workflow name set to '%s'" % name)
+        self._name = name
+        if (logger.isEnabledFor(logging.DEBUG)):
+            logger.debug("workflow name set to '%s'" % name)
 
     name = property(get_name, set_name)
 
     def _ensure_existing_job (self, name):
-        job_node_key = (_NODE_TYPE.JOB, name)
-        if (not job_node_key in self._graph):
+        if (not name in self._jobs):
             raise errors.SpateException("unknown job '%s'" % name)
 
-        return job_node_key
+        return self._jobs[name]
 
     def _ensure_existing_path (self, path):
-        path_node_key = (_NODE_TYPE.PATH, path)
-        if (not path_node_key in self._graph):
+        if (not path in self._paths):
             raise errors.SpateException("unknown path '%s'" % path)
 
-        return path_node_key
-
     def add_job (self, inputs = None, outputs = None, content = None,
         name = None, **kwargs):
         """ Add a job to this workflow
@@ -124,12 +196,15 @@ class _workflow:
         return self.add_jobs(((
             inputs, outputs, content, name, kwargs),))[0]
 
-    def add_jobs (self, job_definitions):
+    def add_jobs (self, job_definitions, check_cycles = True):
         """ Add several jobs to this workflow
 
             Arguments:
                 job_definitions (list of list): list of job definitions, as
                     sub-lists of arguments for the `add_job()` function
+                check_cycles (boolean, optional): if set to True (default),
+                    will ensure the jobs do not create any cycle in the
+                    workflow; if False, this verification is skipped
 
             Returns:
                 list of str: job names
@@ -143,6 +218,10 @@ class _workflow:
                 of the workflow is done only once per jobs set
             [4] This function uses a transaction-like approach: if one of the
                 job cannot be added successfully, the whole set is ignored
+            [5] Skipping the verification of cycles is meant for bulk loading
+                of jobs known to form a directed acyclic graph, e.g. when
+                copied from another workflow; if they do create a cycle, a
+                SpateException will be raised when listing jobs instead
         """
         if (not utils.is_iterable(job_definitions)):
             raise ValueError(
@@ -150,6 +229,19 @@ class _workflow:
 
         job_names, job_index = [], self.number_of_jobs + 1
 
+        # jobs are collected first, then
+        # inserted in the graph in a single operation
+        new_jobs, new_job_names, new_paths = [], {}, {}
+        new_output_paths = {}
+
+        def canonical_path (path):
+            if (path in self._paths):
+                return self._paths[path]
+            return new_paths.setdefault(path, path)
+
+        # debug messages are only formatted if they are to be logged
+        is_debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
         delayed_exception = None
         for job_definition in job_definitions:
             try:
@@ -159,26 +251,43 @@ class _workflow:
                     "invalid job definition in position %d" % len(job_names))
                 break
 
-            input_paths = utils.ensure_iterable(inputs)
-            output_paths = utils.ensure_iterable(outputs)
+            input_paths = tuple(utils.ensure_iterable(inputs))
+            output_paths = tuple(utils.ensure_iterable(outputs))
 
-            # a default job name is created if none is provided
+            # a default job name is created if none is provided,
+            # skipping over names already taken by other jobs
             if (name is None):
                 name = "JOB_%d" % job_index
+                while (name in self._jobs) or (name in new_job_names):
+                    job_index += 1
+                    name = "JOB_%d" % job_index
                 job_index += 1
 
             # constraint: job names must be strings
-            elif (not utils.is_string(name)):
+            elif (not isinstance(name, basestring)):
                 delayed_exception = ValueError(
                     "invalid job name '%s': must be a string" % name)
                 break
 
+            # constraint: job content must be a string
+            if (content is not None) and (not isinstance(content, basestring)):
+                delayed_exception = ValueError(
+                    "invalid type for content (should be str): %s" % \
+                    type(content))
+                break
+
+            # constraint: job keyword arguments must be a dictionary
             if (kwargs is None):
                 kwargs = {}
 
+            elif (not utils.is_dict(kwargs)):
+                delayed_exception = ValueError(
+                    "invalid type for kwargs (should be dict): %s" % \
+                    type(kwargs))
+                break
+
             # constraint: job names must be unique
-            job_node_key = (_NODE_TYPE.JOB, name)
-            if (job_node_key in self._graph):
+            if (name in self._jobs) or (name in new_job_names):
                 delayed_exception = errors.SpateException(
                     "invalid job name '%s': already taken" % name)
                 break
@@ -198,63 +307,83 @@ class _workflow:
                     "invalid job '%s': no input nor output declared" % name)
                 break
 
-            self._graph.add_node(
-                job_node_key,
-                _code = None,
-                _argv = None)
+            # constraint: any given path is the product of at most one job
+            for output_path in output_paths:
+                producing_job_names = []
+                if (output_path in self._producers):
+                    producing_job_names.append(self._producers[output_path])
+                if (output_path in new_output_paths):
+                    producing_job_names.append(new_output_paths[output_path])
+
+                if (len(producing_job_names) > 0):
+                    producing_job_names.append(name)
+                    delayed_exception = errors.SpateException(
+                        "path '%s' is created by more than one job: %s" % (
+                        output_path, ', '.join(["'%s'" % job_name \
+                            for job_name in producing_job_names])))
+                    break
+
+                new_output_paths[output_path] = name
+
+            if (delayed_exception is not None):
+                break
 
-            for (n, input_path) in enumerate(input_paths):
-                self._graph.add_edge(
-                    (_NODE_TYPE.PATH, input_path),
-                    job_node_key,
-                    _order = n + 1)
+            input_paths = tuple(map(canonical_path, input_paths))
+            output_paths = tuple(map(canonical_path, output_paths))
 
-            for (n, output_path) in enumerate(output_paths):
-                self._graph.add_edge(
-                    job_node_key,
-                    (_NODE_TYPE.PATH, output_path),
-                    _order = n + 1)
+            # the input and output paths are stored as ordered tuples in
+            # the job record; content and keyword arguments are validated
+            # at that point
+            new_jobs.append((name,
+                _job(input_paths, output_paths, content, kwargs.copy())))
 
             job_names.append(name)
+            new_job_names[name] = True
 
-            try:
-                self.set_job_content(name, content)
-                self.set_job_kwargs(name, **kwargs)
+            if (is_debug_enabled):
+                logger.debug("job '%s' added (inputs: %s; outputs: %s)" % (
+                    name, ' '.join(input_paths), ' '.join(output_paths)))
 
-            except Exception as exception:
-                delayed_exception = exception
-                break
+        # if any job definition was invalid, nothing has been added yet
+        if (delayed_exception is not None):
+            raise delayed_exception
 
-            logger.debug("job '%s' added (inputs: %s; outputs: %s)" % (
-                name, ' '.join(input_paths), ' '.join(output_paths)))
+        self._paths.update(new_paths)
+        for (name, job) in new_jobs:
+            self._jobs[name] = job
 
-        if (delayed_exception is None):
-            # constraint: any given path is the product of at most one job
-            for (node_type, path) in self._graph.nodes():
-                if (node_type != _NODE_TYPE.PATH):
-                    continue
+            for input_path in job.inputs:
+                self._consumers.setdefault(input_path, set()).add(name)
 
-                path_node_key = (node_type, path)
-                if (self._graph.in_degree(path_node_key) < 2):
-                    continue
+            for output_path in job.outputs:
+                self._producers[output_path] = name
 
-                producing_job_names = ["'%s'" % name for (_, name) in \
-                    self._graph.predecessors(path_node_key)]
+        self._version += 1
+        self._fingerprint = None
 
-                delayed_exception = errors.SpateException(
-                    "path '%s' is created by more than one job: %s" % (
-                    path, ', '.join(producing_job_names)))
-                break
+        for (name, job) in new_jobs:
+            self._in_degree[name] = sum(1 for input_path in job.inputs \
+                if (input_path in self._producers))
 
-        if (delayed_exception is None):
-            # constraint: the workflow must be a directed acyclic graph
-            if (not networkx.is_directed_acyclic_graph(self._graph)):
-                delayed_exception = errors.SpateException(
-                    "unable to add job%s %s without creating cycles" % (
-                        's' if (len(job_names) != 1) else '',
-                        ', '.join(["'%s'" % name for name in job_names])))
+            # existing jobs consuming the outputs of this
+            # new job now have one more upstream job each
+            for output_path in job.outputs:
+                for consumer in self._consumers.get(output_path, ()):
+                    if (not consumer in new_job_names):
+                        self._in_degree[consumer] += 1
 
-        # if any exception was thrown by one of the job addition,
+            self._update_chained_paths(job.inputs + job.outputs)
+
+        # constraint: the workflow must be a directed acyclic graph; as
+        # it was before this transaction, any new cycle would have to
+        # go through one of the new jobs
+        if (check_cycles) and (self._has_cycle(job_names)):
+            delayed_exception = errors.SpateException(
+                "unable to add job%s %s without creating cycles" % (
+                    's' if (len(job_names) != 1) else '',
+                    ', '.join(["'%s'" % name for name in job_names])))
+
+        # if any of the added jobs breaks the workflow topology,
         # we remove all jobs that were added in this transaction
         if (delayed_exception is not None):
             for name in job_names:
@@ -262,11 +391,84 @@ class _workflow:
 
             raise delayed_exception
 
-        logger.debug("%d job%s added" % (
-            len(job_names), 's' if (len(job_names) != 1) else ''))
+        if (is_debug_enabled):
+            logger.debug("%d job%s added" % (
+                len(job_names), 's' if (len(job_names) != 1) else ''))
 
         return job_names
 
+    def _iter_successors (self, name):
+        # jobs consuming any of the outputs of a job; a
+        # job is listed once for every path it consumes
+        for output_path in self._jobs[name].outputs:
+            for successor in self._consumers.get(output_path, ()):
+                yield successor
+
+    def _has_cycle (self, names):
+        # iterative depth-first search from the given jobs, with jobs
+        # marked as either in progress (on the current path) or done;
+        # reaching a job in progress means a cycle has been found
+        _IN_PROGRESS, _DONE = 1, 2
+
+        job_state = {}
+        for name in names:
+            if (name in job_state):
+                continue
+
+            job_state[name] = _IN_PROGRESS
+            stack = [(name, self._iter_successors(name))]
+
+            while (len(stack) > 0):
+                name, successors = stack[-1]
+                for successor in successors:
+                    successor_state = job_state.get(successor)
+                    if (successor_state is None):
+                        job_state[successor] = _IN_PROGRESS
+                        stack.append((successor,
+                            self._iter_successors(successor)))
+                        break
+
+                    elif (successor_state == _IN_PROGRESS):
+                        return True
+                else:
+                    job_state[name] = _DONE
+                    stack.pop()
+
+        return False
+
+    def _topological_sort (self):
+        # Kahn's algorithm: jobs are listed once all the jobs producing
+        # their inputs have been; among the jobs ready to be listed, the
+        # first one inserted comes first, making the order deterministic
+        jobs, consumers = self._jobs, self._consumers
+        job_index = dict((name, i) for (i, name) in enumerate(jobs))
+
+        in_degree = self._in_degree.copy()
+
+        # jobs in order of insertion form a valid heap as they are
+        queue = [(i, name) for (i, name) in enumerate(jobs) \
+            if (in_degree[name] == 0)]
+
+        names = []
+        while (len(queue) > 0):
+            _, name = heapq.heappop(queue)
+            names.append(name)
+
+            for output_path in jobs[name].outputs:
+                for successor in consumers.get(output_path, ()):
+                    in_degree[successor] -= 1
+                    if (in_degree[successor] == 0):
+                        heapq.heappush(queue,
+                            (job_index[successor], successor))
+
+        # jobs never listed are part of a cycle, which
+        # can only exist if added without verification
+        if (len(names) != len(jobs)):
+            raise errors.SpateException(
+                "unable to sort jobs: the workflow contains cycles")
+
+        return names
+
     def remove_job (self, name):
         """ Remove an existing job from this workflow
 
@@ -279,21 +481,53 @@ class _workflow:
             Notes:
             [1] A SpateException will be raised if the job doesn't exist
         """
-        job_node_key = self._ensure_existing_job(name)
-        input_paths, output_paths = self.get_job_paths(name)
+        job = self._ensure_existing_job(name)
+        input_paths, output_paths = job.inputs, job.outputs
+
+        # remove the job itself and its edges, then
+        del self._jobs[name]
+        for input_path in input_paths:
+            consumers = self._consumers[input_path]
+            consumers.discard(name)
+            if (len(consumers) == 0):
+                del self._consumers[input_path]
+
+        for output_path in output_paths:
+            del self._producers[output_path]
+            for consumer in self._consumers.get(output_path, ()):
+                self._in_degree[consumer] -= 1
+
+        del self._in_degree[name]
+
+        is_debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if (is_debug_enabled):
+            logger.debug("job '%s' removed" % name)
+
+        # in a single pass over the input and output paths, paths that
+        # are no longer both produced and consumed are unchained, and
+        # those left disconnected are removed
+        for path in input_paths + output_paths:
+            is_produced = (path in self._producers)
+            is_consumed = (path in self._consumers)
+            if (is_produced) and (is_consumed):
+                continue
 
-        # remove the job node itself, then
-        self._graph.remove_node(job_node_key)
-        logger.debug("job '%s' removed" % name)
+            self._chained_paths.pop(path, None)
 
-        # remove any input or output path
-        # that would be left disconnected
-        for path in input_paths + output_paths:
-            path_node_key = (_NODE_TYPE.PATH, path)
-            if (path_node_key in self._graph) and \
-               (self._graph.degree(path_node_key) == 0):
-                self._graph.remove_node(path_node_key)
-                logger.debug("removed orphan path '%s'" % path)
+            if (not is_produced) and (not is_consumed) and \
+               (self._paths.pop(path, None) is not None):
+                if (is_debug_enabled):
+                    logger.debug("removed orphan path '%s'" % path)
+
+        self._version += 1
+        self._fingerprint = None
+
+    def _update_chained_paths (self, paths):
+        for path in paths:
+            if (path in self._producers) and (path in self._consumers):
+                self._chained_paths[path] = True
+            else:
+                self._chained_paths.pop(path, None)
 
     def has_job (self, name):
         """ Test if a job is part of this workflow
@@ -323,10 +557,31 @@ class _workflow:
             return False
 
     def __contains__ (self, name):
-        if (not utils.is_string(name)):
+        if (not isinstance(name, basestring)):
             return False
 
-        return ((_NODE_TYPE.JOB, name) in self._graph)
+        return (name in self._jobs)
+
+    def _sorted_jobs (self):
+        # the topological sort of the jobs, along with their input and output
+        # paths, is only recalculated if the graph has been modified
+        if (self._jobs_order is None) or \
+           (self._jobs_order[0] != self._version):
+            # if no job depends on another, the order of insertion is
+            # a valid topological order; else the graph is sorted
+            if (len(self._chained_paths) == 0):
+                names = self._jobs.keys()
+            else:
+                names = self._topological_sort()
+
+            jobs = []
+            for name in names:
+                job = self._jobs[name]
+                jobs.append((name, job.inputs, job.outputs))
+
+            self._jobs_order = (self._version, tuple(jobs))
+
+        return self._jobs_order[1]
 
     @property
     def number_of_jobs (self):
@@ -341,9 +596,7 @@ class _workflow:
             Notes:
             [1] This function can also be used as a getter
         """
-        return len(filter(
-            lambda (node_type, node): (node_type == _NODE_TYPE.JOB),
-            self._graph.nodes_iter()))
+        return len(self._jobs)
 
     @property
     def number_of_paths (self):
@@ -358,12 +611,11 @@ class _workflow:
             Notes:
             [1] This function can also be used as a getter
         """
-        return len(filter(
-            lambda (node_type, node): (node_type == _NODE_TYPE.PATH),
-            self._graph.nodes_iter()))
+        return len(self._paths)
 
     def list_jobs (self, outdated_only = True, with_descendants = True,
-        with_paths = False, with_status = False):
+        with_paths = False, with_status = False, lazy_mtime = False,
+        mtime_cache = None, threads = None):
         """ List jobs in this workflow, in the order of their execution
 
             Arguments:
@@ -379,6 +631,15 @@ class _workflow:
                     return jobs input and output paths
                 with_status (boolean, optional): if set to True, will also
                     return a status code for the job, input and output paths
+                lazy_mtime (boolean, optional): if set to True, will retrieve
+                    the modification time of paths only when first needed
+                    rather than all at once before listing the jobs
+                mtime_cache (dict, optional): modification time of paths,
+                    shared between successive calls; paths not found in
+                    this dictionary are looked up and added to it
+                threads (int, optional): if greater than one, number of
+                    threads used to retrieve the modification time of paths
+                    concurrently; ignored if lazy_mtime is set to True
 
             Yields: either
                 str: job name
@@ -398,46 +659,132 @@ class _workflow:
                 - one of its output path is missing
                 - one of its input path is produced by an outdated job
                 - one of its input path is newer than one of its output path
+            [3] Retrieving modification times lazily is suited to callers
+                consuming only the first few jobs, as paths of jobs that are
+                never reached are not looked up; the resulting list of jobs
+                is the same either way
+            [4] A modification time cache spares looking up the same paths
+                when listing jobs several times in a row, e.g. once for all
+                jobs and once for outdated jobs only; it should be discarded
+                as soon as any path may have been modified
+            [5] Retrieving modification times with several threads only pays
+                off on file systems with a high latency, such as network file
+                systems; on a local disk, a single thread is faster
         """
-        # (1) retrieve paths modification time and jobs execution order
-        path_mtime, job_names = {}, []
-        for (node_type, node) in networkx.topological_sort(self._graph):
-            if (node_type == _NODE_TYPE.PATH):
-                path_mtime[node] = paths.path_mtime(node)
-            elif (node_type == _NODE_TYPE.JOB):
-                job_names.append(node)
+        # (1) retrieve jobs execution order
+        jobs = self._sorted_jobs()
+
+        # paths modification time are retrieved either in a single batch or
+        # when first needed, then released once all jobs using these paths
+        # have been processed
+        if (lazy_mtime):
+            path_mtime = {}
+
+        elif (mtime_cache is None):
+            path_mtime = paths.paths_mtime(self._paths, threads)
+
+        else:
+            mtime_cache.update(paths.paths_mtime([path \
+                for path in self._paths if (not path in mtime_cache)],
+                threads))
+            path_mtime = dict([(path, mtime_cache[path]) \
+                for path in self._paths])
+
+        path_pending_uses = {}
 
         flagged_for_creation_or_update = {}
             # paths that will be (re)generated by another job
 
+        # the status of each path is only needed if returned to the user
+        with_paths_status = (with_status) and (with_paths)
+
+        # the causes for execution are collected in the same
+        # dictionary for all jobs, cleared before each job
+        cause_for_execution = {}
+
+        # the shape of the listed items is selected once for all jobs;
+        # (i) the user only wants job names
+        if (not with_paths) and (not with_status):
+            list_item = lambda name, job_status, input_paths, output_paths: \
+                name
+
+        # (ii) the user wants status but not paths
+        elif (with_status) and (not with_paths):
+            list_item = lambda name, job_status, input_paths, output_paths: \
+                (name, job_status)
+
+        # (iii) the user wants paths but not status
+        elif (not with_status) and (with_paths):
+            list_item = lambda name, job_status, input_paths, output_paths: \
+                (name, input_paths, output_paths)
+
+        # (iv) the users want both paths and status
+        else:
+            list_item = lambda name, job_status, input_paths, output_paths: \
+                (name, job_status,
+                    tuple([(path, paths_status[path]) \
+                        for path in input_paths]),
+                    tuple([(path, paths_status[path]) \
+                        for path in output_paths]))
+
         # (2) identify jobs that need to be re-run, either...
-        for name in job_names:
-            cause_for_execution = {}
-            input_paths, output_paths = self.get_job_paths(name)
+        for (name, input_paths, output_paths) in jobs:
+            cause_for_execution.clear()
+            job_paths = input_paths + output_paths
+
+            for path in job_paths:
+                if (not path in path_pending_uses):
+                    path_pending_uses[path] = len(
+                        self._consumers.get(path, ()))
+                    if (not lazy_mtime):
+                        continue
+
+                    if (mtime_cache is None):
+                        path_mtime[path] = paths.path_mtime(path)
+                    else:
+                        if (not path in mtime_cache):
+                            mtime_cache[path] = paths.path_mtime(path)
+                        path_mtime[path] = mtime_cache[path]
 
+            has_outdated_input = False
             for input_path in input_paths:
                 # (a) because one of the input will be (re)generated
                 if (input_path in flagged_for_creation_or_update):
                     cause_for_execution[input_path] = PATH_STATUS.OUTDATED
+                    has_outdated_input = True
+                    if (not with_paths_status):
+                        break
 
-            for output_path in output_paths:
-                # (b) because one of the output is missing
-                if (path_mtime[output_path] is None):
-                    cause_for_execution[output_path] = PATH_STATUS.MISSING
-
-            for input_path in input_paths:
-                input_mtime = path_mtime[input_path]
-                if (input_mtime is None):
-                    continue
-
+            # unless the status of all paths is requested, the first
+            # cause found is enough to flag the job as outdated
+            if (with_paths_status) or (len(cause_for_execution) == 0):
                 for output_path in output_paths:
-                    output_mtime = path_mtime[output_path]
-                    if (output_mtime is None):
-                        continue
-
-                    # (c) because one of the input is newer than one of the output
-                    if (input_mtime > output_mtime):
-                        cause_for_execution[output_path] = PATH_STATUS.OUTDATED
+                    # (b) because one of the output is missing
+                    if (path_mtime[output_path] is None):
+                        cause_for_execution[output_path] = PATH_STATUS.MISSING
+
+            if (with_paths_status) or (len(cause_for_execution) == 0):
+                # an output is older than one of the inputs if and
+                # only if it is older than the most recent input
+                latest_input_mtime = None
+                for input_path in input_paths:
+                    input_mtime = path_mtime[input_path]
+                    if (input_mtime is not None) and \
+                       ((latest_input_mtime is None) or \
+                        (input_mtime > latest_input_mtime)):
+                        latest_input_mtime = input_mtime
+
+                if (latest_input_mtime is not None):
+                    for output_path in output_paths:
+                        output_mtime = path_mtime[output_path]
+                        if (output_mtime is None):
+                            continue
+
+                        # (c) because one of the input is newer
+                        # than one of the output
+                        if (latest_input_mtime > output_mtime):
+                            cause_for_execution[output_path] = \
+                                PATH_STATUS.OUTDATED
 
             # if no cause has been listed at that point, the job is current
             if (len(cause_for_execution) == 0):
@@ -449,17 +796,28 @@ class _workflow:
                 for output_path in output_paths:
                     flagged_for_creation_or_update[output_path] = True
 
-            paths_status = cause_for_execution
+            if (with_paths_status):
+                paths_status = cause_for_execution
+
+                for path in job_paths:
+                    # any non existing path is flagged as missing,
+                    # replacing prior flagging as outdated (if any)
+                    if (path_mtime[path] is None):
+                        paths_status[path] = PATH_STATUS.MISSING
 
-            for path in input_paths + output_paths:
-                # any non existing path is flagged as missing,
-                # replacing prior flagging as outdated (if any)
-                if (path_mtime[path] is None):
-                    paths_status[path] = PATH_STATUS.MISSING
+                    # any path not flagged at that point is current
+                    elif (not path in paths_status):
+                        paths_status[path] = PATH_STATUS.CURRENT
 
-                # any path not flagged at that point is current
-                elif (not path in paths_status):
-                    paths_status[path] = PATH_STATUS.CURRENT
+            # paths that won't be used by any other job are released
+            for input_path in input_paths:
+                path_pending_uses[input_path] -= 1
+
+            for path in job_paths:
+                if (path_pending_uses[path] == 0):
+                    del path_mtime[path]
+                    del path_pending_uses[path]
+                    flagged_for_creation_or_update.pop(path, None)
 
             # we skip this job if only outdated jobs are requested
             if (outdated_only) and (job_status == JOB_STATUS.CURRENT):
@@ -470,10 +828,7 @@ class _workflow:
                 if (outdated_only):
                     # we skip this job if it depends on any other obsolete
                     # job and the user only outdated non-dependent jobs
-                    for input_path in input_paths:
-                        if (input_path in flagged_for_creation_or_update):
-                            depends_on_previous_job = True
-                            break
+                    depends_on_previous_job = has_outdated_input
                 else:
                     # we skip this job if it depends on any other
                     # job and the user wants all non-dependent jobs
@@ -483,24 +838,7 @@ class _workflow:
                 if (depends_on_previous_job):
                     continue
 
-            # the user only wants job names
-            if (not with_paths) and (not with_status):
-                yield name
-
-            # the user wants status but not paths
-            elif (with_status) and (not with_paths):
-                yield (name, job_status)
-
-            # the user wants paths but not status
-            elif (not with_status) and (with_paths):
-                yield (name, input_paths, output_paths)
-
-            # the users want both paths and status
-            else:
-                add_status = lambda path: (path, paths_status[path])
-                yield (name, job_status,
-                    tuple(map(add_status, input_paths)),
-                    tuple(map(add_status, output_paths)))
+            yield list_item(name, job_status, input_paths, output_paths)
 
     def get_job_predecessors (self, name):
         """ Return job(s) upstream of a given job, if any
@@ -511,19 +849,14 @@ class _workflow:
             Returns:
                 list of str: list of job names
         """
-        job_node_key = self._ensure_existing_job(name)
-
-        input_node_keys = []
-        for (_, input_path) in self._graph.predecessors(job_node_key):
-            input_node_key = (_NODE_TYPE.PATH, input_path)
-            edge = self._graph[input_node_key][job_node_key]
-            input_node_keys.append((edge["_order"], input_node_key))
+        input_paths, _ = self.get_job_paths(name)
 
-        input_jobs = []
-        for (_, input_node_key) in sorted(input_node_keys):
-            for (_, name) in self._graph.predecessors(input_node_key):
-                if (not name in input_jobs):
-                    input_jobs.append(name)
+        input_jobs, seen = [], {}
+        for input_path in input_paths:
+            name = self._producers.get(input_path)
+            if (name is not None) and (not name in seen):
+                input_jobs.append(name)
+                seen[name] = True
 
         return tuple(input_jobs)
 
@@ -536,19 +869,14 @@ class _workflow:
             Returns:
                 list of str: list of job names
         """
-        job_node_key = self._ensure_existing_job(name)
-
-        output_node_keys = []
-        for (_, output_path) in self._graph.successors(job_node_key):
-            output_node_key = (_NODE_TYPE.PATH, output_path)
-            edge = self._graph[job_node_key][output_node_key]
-            output_node_keys.append((edge["_order"], output_node_key))
-
-        output_jobs = []
-        for (_, output_node_key) in sorted(output_node_keys):
-            for (_, name) in self._graph.successors(output_node_key):
-                if (not name in output_jobs):
+        _, output_paths = self.get_job_paths(name)
+
+        output_jobs, seen = [], {}
+        for output_path in output_paths:
+            for name in self._consumers.get(output_path, ()):
+                if (not name in seen):
                     output_jobs.append(name)
+                    seen[name] = True
 
         return tuple(output_jobs)
 
@@ -565,21 +893,8 @@ class _workflow:
             Notes:
             [1] A SpateException will be raised if the job doesn't exist
         """
-        job_node_key = self._ensure_existing_job(name)
-
-        input_paths = []
-        for (_, path) in self._graph.predecessors(job_node_key):
-            edge = self._graph[(_NODE_TYPE.PATH, path)][job_node_key]
-            input_paths.append((edge["_order"], path))
-
-        output_paths = []
-        for (_, path) in self._graph.successors(job_node_key):
-            edge = self._graph[job_node_key][(_NODE_TYPE.PATH, path)]
-            output_paths.append((edge["_order"], path))
-
-        return (
-            tuple([path for (_, path) in sorted(input_paths)]),
-            tuple([path for (_, path) in sorted(output_paths)]))
+        job = self._ensure_existing_job(name)
+        return (job.inputs, job.outputs)
 
     def get_path_jobs (self, path):
         """ Return upstream and downstream jobs associated with a path, if any
@@ -594,19 +909,16 @@ class _workflow:
             Notes:
             [1] A SpateException will be raised if the path doesn't exist
         """
-        path_node_key = self._ensure_existing_path(path)
-
-        upstream_jobs = []
-        for (_, name) in self._graph.predecessors(path_node_key):
-            upstream_jobs.append(name)
+        self._ensure_existing_path(path)
 
-        downstream_jobs = []
-        for (_, name) in self._graph.successors(path_node_key):
-            downstream_jobs.append(name)
+        if (path in self._producers):
+            upstream_jobs = (self._producers[path],)
+        else:
+            upstream_jobs = ()
 
         return (
-            tuple(sorted(upstream_jobs)),
-            tuple(sorted(downstream_jobs)))
+            upstream_jobs,
+            tuple(sorted(self._consumers.get(path, ()))))
 
     def get_job_content (self, name):
         """ Return the executable content associated with a job, if any
@@ -620,8 +932,7 @@ class _workflow:
             Notes:
             [1] A SpateException will be raised if the job doesn't exist
         """
-        job_node_key = self._ensure_existing_job(name)
-        return self._graph.node[job_node_key]["_content"]
+        return self._ensure_existing_job(name).content
 
     def set_job_content (self, name, content):
         """ Set or update a job executable content
@@ -636,20 +947,43 @@ class _workflow:
             Notes:
             [1] A SpateException will be raised if the job doesn't exist
         """
-        job_node_key = self._ensure_existing_job(name)
+        job = self._ensure_existing_job(name)
 
-        if (content is not None) and (not utils.is_string(content)):
+        if (content is not None) and (not isinstance(content, basestring)):
             raise ValueError("invalid type for content (should be str): %s" %
                 type(content))
 
-        self._graph.node[job_node_key]["_content"] = content
+        job.content = content
+        self._fingerprint = None
+
+    def compile_job_contents (self, names = None, template_engine = None):
+        """ Compile the content of several jobs in a single pass
+
+            Arguments:
+                names (list of str, optional): names of the jobs to compile;
+                    if none provided, the content of all jobs is compiled
+                template_engine (obj, optional): template engine class; if
+                    none provided, the current template engine is used
+
+            Returns:
+                int: number of distinct job contents compiled
+
+            Notes:
+            [1] A SpateException will be raised if a job doesn't exist, or
+                if a job content is invalid
+        """
+        # all jobs are read off the job index; listing them through
+        # list_jobs() would sort them and check the status of their paths
+        if (names is None):
+            names = list(self._jobs)
+
+        return templating.compile_job_contents(self, names, template_engine)
 
     def render_job_content (self, name, template_engine = None):
         return templating.render_job_content(self, name, template_engine)
 
     def _job_kwargs (self, name):
-        job_node_key = self._ensure_existing_job(name)
-        return self._graph.node[job_node_key].setdefault("_kwargs", {})
+        return self._ensure_existing_job(name).kwargs
 
     def set_kwargs (self, **kwargs):
         """ Set keyword arguments for the workflow
@@ -679,8 +1013,8 @@ class _workflow:
             [1] A SpateException will be raised if the job doesn't exist
             [2] Any previous keyword argument is deleted
         """
-        job_node_key = self._ensure_existing_job(name)
-        self._graph.node[job_node_key]["_kwargs"] = kwargs
+        self._ensure_existing_job(name).kwargs = kwargs
+        self._fingerprint = None
 
     def set_kwarg (self, key, value):
         """ Set or update a keyword argument for the workflow
@@ -713,6 +1047,7 @@ class _workflow:
             [2] Any previous value for this keyword argument is overwritten
         """
         self._job_kwargs(name)[key] = value
+        self._fingerprint = None
 
     def get_kwargs (self):
         """ Return a copy of the workflow keyword arguments
@@ -820,6 +1155,28 @@ class _workflow:
             [2] A KeyError will be raised if the keyword argument is not found
         """
         del self._job_kwargs(name)[key]
+        self._fingerprint = None
+
+    def _get_fingerprint (self):
+        # order-independent combination of a hash per job; two equal
+        # workflows have the same fingerprint, while different ones
+        # most likely have different fingerprints
+        if (self._fingerprint is None):
+            fingerprint = 0
+            for (name, job) in self._jobs.iteritems():
+                # only values hashed by value are folded in; the
+                # others are compared in full by __eq__
+                kwargs_hash = 0
+                for (key, value) in job.kwargs.iteritems():
+                    kwargs_hash ^= hash((key, _value_hash(value)))
+
+                fingerprint ^= hash((name,
+                    frozenset(job.inputs), frozenset(job.outputs),
+                    job.content, kwargs_hash))
+
+            self._fingerprint = fingerprint
+
+        return self._fingerprint
 
     def __eq__ (self, obj):
         if (not isinstance(obj, self.__class__)):
@@ -832,25 +1189,28 @@ class _workflow:
            (self.number_of_paths != obj.number_of_paths):
             return False
 
-        list_jobs = lambda obj: sorted(obj.list_jobs(
-            outdated_only = False, with_paths = True))
+        if (self._get_fingerprint() != obj._get_fingerprint()):
+            return False
+
+        # paths are most often declared in the same order in both
+        # workflows, in which case they need not be sorted to be compared
+        same_paths = lambda paths_a, paths_b: \
+            (paths_a == paths_b) or (sorted(paths_a) == sorted(paths_b))
 
-        for (job_name_a, input_paths_a, output_paths_a), \
-            (job_name_b, input_paths_b, output_paths_b) in \
-            zip(list_jobs(self), list_jobs(obj)):
-            if (job_name_a != job_name_b):
+        # jobs are paired by name, regardless of their order of insertion
+        for (name, job_a) in self._jobs.iteritems():
+            job_b = obj._jobs.get(name)
+            if (job_b is None):
                 return False
 
-            if (sorted(input_paths_a) != sorted(input_paths_b)) or \
-               (sorted(output_paths_a) != sorted(output_paths_b)):
+            if (not same_paths(job_a.inputs, job_b.inputs)) or \
+               (not same_paths(job_a.outputs, job_b.outputs)):
                 return False
 
-            if (self.get_job_content(job_name_a) != \
-                obj.get_job_content(job_name_b)):
+            if (job_a.content != job_b.content):
                 return False
 
-            if (self.get_job_kwargs(job_name_a) != \
-                obj.get_job_kwargs(job_name_b)):
+            if (job_a.kwargs != job_b.kwargs):
                 return False
 
         return True
@@ -864,14 +1224,17 @@ class _workflow:
 
         merged_workflow = _workflow("%s+%s" % (self.name, obj.name))
 
-        for workflow in (self, obj):
-            jobs = workflow.list_jobs(outdated_only = False, with_paths = True)
-            for (name, input_paths, output_paths) in jobs:
-                merged_workflow.add_job(
-                    input_paths, output_paths,
-                    "%s:%s" % (workflow.name, name),
-                    workflow.get_job_content(name),
-                    **workflow.get_job_kwargs(name))
+        # jobs are read from the job records, in order of insertion, as
+        # neither their status nor their execution order are needed; they
+        # are then added in a single transaction, as paths shared between
+        # both workflows may still create conflicts or cycles
+        def jobs():
+            for workflow in (self, obj):
+                for (name, job) in workflow._jobs.iteritems():
+                    yield (job.inputs, job.outputs, job.content,
+                        "%s:%s" % (workflow.name, name), job.kwargs)
+
+        merged_workflow.add_jobs(jobs())
 
         logger.debug("merged workflow %s with %s" % (self, obj))
         return merged_workflow
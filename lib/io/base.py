@@ -2,6 +2,7 @@
 import collections
 import json
 import logging
+import operator
 
 from .. import core
 from .. import errors
@@ -80,15 +81,20 @@ def to_json (workflow, outdated_only = True):
     """
     utils.ensure_workflow(workflow)
 
-    data = {
-        "workflow": {
-            "name": workflow.name
-        },
-        "jobs": []
-    }
+    # keys are ordered as written by save(), whatever the hash seed
+    data = collections.OrderedDict()
+    data["jobs"] = list(_json_jobs(workflow, outdated_only))
+    data["workflow"] = {"name": workflow.name}
 
-    for name in sorted(workflow.list_jobs(outdated_only = outdated_only)):
-        job_inputs, job_outputs = workflow.get_job_paths(name)
+    return data
+
+def _json_jobs (workflow, outdated_only):
+    # jobs are listed along with their paths, and sorted by name
+    jobs = sorted(workflow.list_jobs(
+        outdated_only = outdated_only, with_paths = True),
+        key = operator.itemgetter(0))
+
+    for (name, job_inputs, job_outputs) in jobs:
         job_entry = collections.OrderedDict(name = name)
 
         if (len(job_inputs) > 0):
@@ -105,9 +111,30 @@ def to_json (workflow, outdated_only = True):
         if (len(job_data) > 0):
             job_entry["kwargs"] = job_data
 
-        data["jobs"].append(job_entry)
+        yield job_entry
 
-    return data
+def _write_json (workflow, outdated_only, target_fh):
+    # the JSON document is written one job at a time, each job being
+    # serialized then indented to its position within the document;
+    # the output is the same as serializing the whole document returned
+    # by to_json() at once, including the order of its keys
+    def dumps (obj, level):
+        return json.dumps(obj,
+            indent = 4,
+            separators = (',', ': ')).replace('\n', '\n' + ' ' * 4 * level)
+
+    target_fh.write('{\n    "jobs": [')
+
+    separator = "\n        "
+    for job_entry in _json_jobs(workflow, outdated_only):
+        target_fh.write(separator + dumps(job_entry, 2))
+        separator = ",\n        "
+
+    if (separator != "\n        "):
+        target_fh.write("\n    ")
+
+    target_fh.write('],\n    "workflow": %s\n}' % (
+        dumps({"name": workflow.name}, 1)))
 
 #:::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::
 
@@ -186,17 +213,24 @@ def load (source):
             documentation of the `from_yaml` method
     """
     source_fh, is_named_source = utils.stream_reader(source)
-    raw_data, data = source_fh.read(), None
+    try:
+        raw_data, data = source_fh.read(), None
+    finally:
+        if (is_named_source):
+            source_fh.close()
 
     try:
         data = json.loads(raw_data)
     except:
         pass
 
-    try:
-        data = yaml.load(raw_data)
-    except:
-        pass
+    # the (much slower) YAML parser is only tried if the document isn't
+    # valid JSON; as JSON is a subset of YAML, it would produce the same
+    if (data is None):
+        try:
+            data = yaml.load(raw_data)
+        except:
+            pass
 
     if (data is None):
         raise errors.SpateException("unknown format for input %s" % source)
@@ -229,8 +263,6 @@ def save (workflow, target, outdated_only = True):
             JSON file, while '.yaml' or '.yaml.gz' will produce a YAML file. If
             no extension is provided JSON is selected as the default format
     """
-    data = to_json(workflow, outdated_only)
-
     target_fh, is_named_target = utils.stream_writer(target)
     target_format = _FILE_FORMAT.JSON
 
@@ -239,12 +271,16 @@ def save (workflow, target, outdated_only = True):
             target.lower().endswith(".yaml.gz")):
             target_format = _FILE_FORMAT.YAML
 
+    # the JSON document is streamed one job at a time rather than built in
+    # full in memory, or written one token at a time as json.dump() would
     if (target_format == _FILE_FORMAT.JSON):
-        json.dump(data, target_fh,
-            indent = 4,
-            separators = (',', ': '))
+        _write_json(workflow, outdated_only, target_fh)
 
     elif (target_format == _FILE_FORMAT.YAML):
-        yaml.dump(data, stream = target_fh,
+        yaml.dump(to_json(workflow, outdated_only), stream = target_fh,
             explicit_start = True,
             default_flow_style = False)
+
+    # named targets are closed to flush any pending compressed data
+    if (is_named_target):
+        target_fh.close()
@@ -59,6 +59,8 @@ def to_makefile (workflow, target, outdated_only = True,
     # write jobs
     target_paths, all_paths = collections.OrderedDict(), {}
 
+    # jobs are accumulated in a buffer, since they
+    # must be written after the main target
     n_jobs, job_contents = 0, []
     for (name, input_paths, output_paths) in jobs:
         # ensure that we have at least one output path
@@ -116,7 +118,6 @@ def to_makefile (workflow, target, outdated_only = True,
     target_fh.write("\n%s: %s\n" % (
         main_target_name, ' '.join(target_paths)))
 
-    for job_content in job_contents:
-        target_fh.write(job_content)
+    target_fh.write(''.join(job_contents))
 
     return n_jobs
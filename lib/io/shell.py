@@ -1,4 +1,5 @@
 
+import StringIO
 import logging
 import os
 import sys
@@ -7,8 +8,6 @@ from .. import core
 from .. import utils as coreutils
 import utils
 
-import colorama
-
 __all__ = (
     "echo",
     "to_shell_script",)
@@ -54,30 +53,27 @@ def echo (workflow, outdated_only = True, decorated = True, colorized = True,
         core.PATH_STATUS.MISSING: " MISSING",
     }
 
-    def job_line (name, job_status):
-        return "%s%s" % (
-            name,
-            {
-                True: _TERMINAL_JOB_LINE_SUFFIX[job_status],
-                False: ''
-            }[with_suffix])
-
-    def path_line (path, path_status, is_input):
-        return "%s %s%s" % (
-            {
-                True: '<',
-                False: '>'
-            }[is_input],
-            path,
-            {
-                True: _TERMINAL_PATH_LINE_SUFFIX[path_status],
-                False: ''
-            }[with_suffix])
-
     if (not decorated):
         colorized = False
 
+    # the format of each type of line is computed once, so that
+    # the display of each job only involves string formatting
+    job_line_format, path_line_format = {}, {}
+
+    for job_status in core.JOB_STATUS:
+        job_line_format[job_status] = "%s" + \
+            (_TERMINAL_JOB_LINE_SUFFIX[job_status] if (with_suffix) else '')
+
+    for path_status in core.PATH_STATUS:
+        for is_input in (True, False):
+            path_line_format[(path_status, is_input)] = \
+                ("< %s" if (is_input) else "> %s") + \
+                (_TERMINAL_PATH_LINE_SUFFIX[path_status] if (with_suffix) else '')
+
     if (decorated or colorized):
+        colorama = utils.ensure_module("colorama",
+            "https://pypi.python.org/pypi/colorama")
+
         colorama.init()
 
         _TERMINAL_JOB_LINE_FGCOLOR = {
@@ -91,26 +87,25 @@ def echo (workflow, outdated_only = True, decorated = True, colorized = True,
             core.PATH_STATUS.OUTDATED: colorama.Style.DIM + colorama.Fore.YELLOW,
         }
 
-        raw_job_line = job_line
-        raw_path_line = path_line
-
-        def job_line (name, job_status):
-            return {
-                    True: _TERMINAL_JOB_LINE_FGCOLOR[job_status],
-                    False: colorama.Style.BRIGHT,
-                }[colorized] + \
-                raw_job_line(name, job_status) + \
-                colorama.Style.RESET_ALL
-
-        def path_line (path, path_status, is_input):
-            return {
-                    (True, True): _TERMINAL_PATH_LINE_FGCOLOR[path_status],
-                    (True, False): _TERMINAL_PATH_LINE_FGCOLOR[path_status],
-                    (False, True): colorama.Style.DIM,
-                    (False, False): '',
-                }[(colorized, is_input)] + \
-                raw_path_line(path, path_status, is_input) + \
-                colorama.Style.RESET_ALL
+        for (job_status, line_format) in job_line_format.items():
+            if (colorized):
+                line_prefix = _TERMINAL_JOB_LINE_FGCOLOR[job_status]
+            else:
+                line_prefix = colorama.Style.BRIGHT
+
+            job_line_format[job_status] = \
+                line_prefix + line_format + colorama.Style.RESET_ALL
+
+        for ((path_status, is_input), line_format) in path_line_format.items():
+            if (colorized):
+                line_prefix = _TERMINAL_PATH_LINE_FGCOLOR[path_status]
+            elif (is_input):
+                line_prefix = colorama.Style.DIM
+            else:
+                line_prefix = ''
+
+            path_line_format[(path_status, is_input)] = \
+                line_prefix + line_format + colorama.Style.RESET_ALL
 
     jobs = workflow.list_jobs(
         outdated_only = outdated_only,
@@ -120,15 +115,20 @@ def echo (workflow, outdated_only = True, decorated = True, colorized = True,
     try:
         n_jobs = 0
         for (name, job_status, input_paths, output_paths) in jobs:
+            lines = []
             for (input_path, path_status) in input_paths:
-                stream.write(path_line(input_path, path_status, True) + '\n')
+                lines.append(
+                    path_line_format[(path_status, True)] % input_path)
 
-            stream.write(job_line(name, job_status) + '\n')
+            lines.append(job_line_format[job_status] % name)
 
             for (output_path, path_status) in output_paths:
-                stream.write(path_line(output_path, path_status, False) + '\n')
+                lines.append(
+                    path_line_format[(path_status, False)] % output_path)
 
-            stream.write('\n')
+            # each job is written to the stream in a single operation
+            lines.append('\n')
+            stream.write('\n'.join(lines))
             n_jobs += 1
 
         if (outdated_only):
@@ -172,11 +172,25 @@ def to_shell_script (workflow, target, outdated_only = True,
             use the "set -e" argument ('errexit', see bash documentation) so
             that any job returning a non-zero exit code aborts the workflow
         [4] If no job is found in the workflow, no file will be created
+        [5] If `target` is the name of an existing file with the same content
+            as the exported workflow, this file is left untouched; this
+            preserves its modification time for tools that depend on it
     """
     utils.ensure_workflow(workflow)
 
-    target_fh, is_named_target = utils.stream_writer(target)
-    logger.debug("exporting %s to %s" % (workflow, target_fh))
+    # job contents are compiled in a single pass before
+    # any output, so that invalid contents are caught early
+    jobs = list(workflow.list_jobs(outdated_only = outdated_only))
+    workflow.compile_job_contents(jobs)
+
+    # named targets are rendered in memory first, and only
+    # written if their content changed (see update_file)
+    if (coreutils.is_string(target)):
+        target_fh, is_named_target = StringIO.StringIO(), True
+    else:
+        target_fh, is_named_target = utils.stream_writer(target)
+
+    logger.debug("exporting %s to %s" % (workflow, target))
 
     target_fh.write("#!%s\n" % shell.strip())
 
@@ -187,7 +201,7 @@ def to_shell_script (workflow, target, outdated_only = True,
             target_fh.write("%s\n" % str(shell_arg).strip())
 
     n_jobs = 0
-    for name in workflow.list_jobs(outdated_only = outdated_only):
+    for name in jobs:
         body = utils.dedent_text_block(
             workflow.render_job_content(name),
             ignore_empty_lines = False)
@@ -198,11 +212,15 @@ def to_shell_script (workflow, target, outdated_only = True,
     logger.debug("%d jobs exported" % n_jobs)
 
     if (is_named_target):
-        target_fh.close()
-        os.chmod(target, 0755)
-
         if (n_jobs == 0):
-            logger.debug("removing named output file '%s'" % target)
-            os.remove(target)
+            if (os.path.exists(target)):
+                logger.debug("removing named output file '%s'" % target)
+                os.remove(target)
+
+        else:
+            if (not utils.update_file(target, target_fh.getvalue())):
+                logger.debug("named output file '%s' is unchanged" % target)
+
+            os.chmod(target, 0755)
 
     return n_jobs
@@ -27,8 +27,10 @@ def stream_reader (source):
             return gzip.open(source, "rb"), True
         elif (source.lower().endswith(".bz2")):
             return bz2.BZ2File(source, "r"), True
+        # files are read as is, as both JSON and YAML
+        # parsers accept any kind of line terminators
         else:
-            return open(source, "rU"), True
+            return open(source, "rb"), True
 
     elif (hasattr(source, "read")):
         return source, False
@@ -36,15 +38,21 @@ def stream_reader (source):
     raise ValueError("invalid source object %s (type: %s)" % (
         source, type(source)))
 
+# compression level for GZip and BZip2-compressed outputs; workflow
+# documents are highly redundant text, and compress well even at the
+# fastest level while saving most of the CPU time of the default (9)
+COMPRESSION_LEVEL = 1
+
 def stream_writer (target):
     if (target is None):
         return sys.stdout, False
 
     elif (utils.is_string(target)):
         if (target.lower().endswith(".gz")):
-            return gzip.open(target, "wb"), True
+            return gzip.open(target, "wb", COMPRESSION_LEVEL), True
         elif (target.lower().endswith(".bz2")):
-            return bz2.BZ2File(target, "w"), True
+            return bz2.BZ2File(target, "w",
+                compresslevel = COMPRESSION_LEVEL), True
         else:
             return open(target, "w"), True
 
@@ -54,6 +62,27 @@ def stream_writer (target):
     raise ValueError("invalid target object %s (type: %s)" % (
         target, type(target)))
 
+def update_file (target, content):
+    # the file is only (re)written if missing or if its current
+    # content differs; returns True if the file was written
+    if (os.path.exists(target)):
+        source_fh, _ = stream_reader(target)
+        try:
+            is_current = (source_fh.read() == content)
+        finally:
+            source_fh.close()
+
+        if (is_current):
+            return False
+
+    target_fh, _ = stream_writer(target)
+    try:
+        target_fh.write(content)
+    finally:
+        target_fh.close()
+
+    return True
+
 #:::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::
 
 def dedent_text_block (text, ignore_empty_lines = False):
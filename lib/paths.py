@@ -1,5 +1,7 @@
 
+import multiprocessing.pool
 import os
+import stat
 
 import enum
 
@@ -20,15 +22,17 @@ def path_type (path):
         return PATH_TYPE.UNKNOWN
 
 def path_mtime (path):
-    path_type_ = path_type(path)
-
-    if (path_type_ == PATH_TYPE.MISSING) or (path_type_ == PATH_TYPE.UNKNOWN):
+    # a single call to stat() gives both the type and modification
+    # time of the path, where path_type() would need up to three
+    try:
+        path_stat = os.stat(path)
+    except OSError:
         return None
 
-    elif (path_type_ == PATH_TYPE.FILE):
-        return os.path.getmtime(path)
+    if (stat.S_ISREG(path_stat.st_mode)):
+        return path_stat.st_mtime
 
-    elif (path_type_ == PATH_TYPE.DIRECTORY):
+    elif (stat.S_ISDIR(path_stat.st_mode)):
         latest_mtime, visited_paths = 0, {}
         for (current_path, subfolders, filenames) in os.walk(path, followlinks = True):
             current_path = os.path.realpath(current_path)
@@ -44,13 +48,46 @@ def path_mtime (path):
                 filename = os.path.join(current_path, filename)
 
                 # we ignore broken symbolic links
-                if (not os.path.isfile(filename)):
+                try:
+                    file_stat = os.stat(filename)
+                except OSError:
+                    continue
+
+                if (not stat.S_ISREG(file_stat.st_mode)):
                     continue
 
-                mtime = os.path.getmtime(filename)
+                mtime = file_stat.st_mtime
                 if (mtime > latest_mtime):
                     latest_mtime = mtime
 
             visited_paths[current_path] = True
 
         return latest_mtime
+
+    # paths of unknown type are considered missing
+    else:
+        return None
+
+def paths_mtime (paths, threads = None):
+    """ Return the modification time of several paths, as a dictionary
+
+        Notes:
+        [1] If a number of threads greater than one is provided, the
+            modification times are retrieved by a pool of threads; the
+            underlying system calls release the global interpreter lock,
+            and can thus run concurrently. This is only worth it on file
+            systems with a high latency, such as network file systems
+    """
+    paths = list(paths)
+
+    if (threads is None) or (threads < 2) or (len(paths) < 2):
+        return dict([(path, path_mtime(path)) for path in paths])
+
+    # the pool is created for this call only, so that no
+    # thread outlives it once all paths have been stated
+    pool = multiprocessing.pool.ThreadPool(threads)
+    try:
+        return dict(zip(paths, pool.map(path_mtime, paths)))
+    finally:
+        pool.close()
+        pool.join()
@@ -8,9 +8,11 @@ import utils
 __all__ = (
     "set_template_engine",
     "get_template_engine",
+    "compile_job_contents",
     "render_job_content",
     "string_template_engine",
-    "mustache_template_engine",)
+    "mustache_template_engine",
+    "jinja2_template_engine",)
 
 def _ensure_template_engine (obj):
     if (not utils.is_class(obj)) or \
@@ -46,6 +48,42 @@ def set_template_engine (template_engine):
         _ensure_template_engine(template_engine)
         _current_template_engine = template_engine
 
+def compile_job_contents (workflow, names, template_engine = None):
+    """ Compile the content of several jobs in a single pass
+
+        Arguments:
+            workflow (object): a workflow object
+            names (list of str): names of the jobs to compile
+            template_engine (obj, optional): template engine class; if none
+                provided, the current template engine is used
+
+        Returns:
+            int: number of distinct job contents compiled
+
+        Notes:
+        [1] Compiled contents are cached and reused by `render_job_content`;
+            calling this function before rendering a set of jobs ensures
+            that invalid contents are reported before any job is rendered
+        [2] A SpateException will be raised if a job content is invalid
+        [3] The content of all jobs of a workflow can be compiled by using
+            the workflow method 'compile_job_contents'
+    """
+    if (template_engine is None):
+        template_engine = get_template_engine()
+    else:
+        _ensure_template_engine(template_engine)
+
+    job_templates = {}
+    for name in names:
+        job_template = workflow.get_job_content(name)
+        if (job_template is None) or (job_template in job_templates):
+            continue
+
+        _compile_template(template_engine, job_template)
+        job_templates[job_template] = True
+
+    return len(job_templates)
+
 def render_job_content (workflow, name, template_engine = None):
     if (template_engine is None):
         template_engine = get_template_engine()
@@ -56,12 +94,10 @@ def render_job_content (workflow, name, template_engine = None):
     if (job_template is None):
         return ''
 
-    # set up the job environment
-    job_env = {}
-    for (k, v) in workflow.get_kwargs().iteritems():
-        job_env[k] = v
-    for (k, v) in workflow.get_job_kwargs(name).iteritems():
-        job_env[k] = v
+    # set up the job environment; this dictionary is the
+    # only one created per job, and is passed as-is to the engine
+    job_env = workflow.get_kwargs()
+    job_env.update(workflow._job_kwargs(name))
 
     job_inputs, job_outputs = workflow.get_job_paths(name)
 
@@ -76,15 +112,53 @@ def render_job_content (workflow, name, template_engine = None):
     for (n, output_path) in enumerate(job_outputs):
         job_env["OUTPUT%d" % n] = output_path
 
-    # render the job template
-    return template_engine.render(job_template, **job_env)
+    # render the job template; the compiled template is rendered directly,
+    # as render() would unpack the job environment into a new dictionary
+    return template_engine.render_compiled(
+        _compile_template(template_engine, job_template), job_env)
 
 #:::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::
 
+_COMPILED_TEMPLATES_CACHE_SIZE = 1024
+
+_compiled_templates = {}
+
+def _compile_template (template_engine, template):
+    # templates are compiled once per engine and source string, then
+    # reused; the cache is simply flushed when it reaches its maximum size
+    key = (template_engine, template)
+    try:
+        return _compiled_templates[key]
+    except KeyError:
+        pass
+
+    try:
+        compiled_template = template_engine.compile(template)
+
+    except Exception as e:
+        raise errors.SpateException(
+            "Unable to compile job content: %s" % e)
+
+    if (len(_compiled_templates) >= _COMPILED_TEMPLATES_CACHE_SIZE):
+        _compiled_templates.clear()
+
+    _compiled_templates[key] = compiled_template
+    return compiled_template
+
 class _base_template_engine:
-    def render (self, template, **kwargs):
+    @classmethod
+    def compile (cls, template):
         return template
 
+    @classmethod
+    def render_compiled (cls, compiled_template, kwargs):
+        return compiled_template
+
+    @classmethod
+    def render (cls, template, **kwargs):
+        return cls.render_compiled(
+            _compile_template(cls, template), kwargs)
+
 class string_template_engine (_base_template_engine):
     """ Python string.Template-based template engine
 
@@ -97,9 +171,44 @@ class string_template_engine (_base_template_engine):
             https://docs.python.org/2/library/string.html#template-strings
     """
     @classmethod
-    def render (cls, template, **kwargs):
+    def compile (cls, template):
+        # the template is translated once into a format string and the
+        # ordered list of its placeholder names, following string.Template
+        # syntax; rendering then boils down to a single formatting operation
+        format_string, keys, position = [], [], 0
+        for match in string.Template.pattern.finditer(template):
+            format_string.append(
+                template[position:match.start()].replace('%', "%%"))
+            position = match.end()
+
+            if (match.group("escaped") is not None):
+                format_string.append(string.Template.delimiter)
+
+            elif (match.group("invalid") is not None):
+                # same report as string.Template._invalid()
+                i = match.start("invalid")
+                lines = template[:i].splitlines(True)
+                if (not lines):
+                    colno, lineno = i + 1, 1
+                else:
+                    colno = i - len(''.join(lines[:-1]))
+                    lineno = len(lines)
+                raise ValueError(
+                    "Invalid placeholder in string: line %d, col %d" % (
+                    lineno, colno))
+
+            else:
+                format_string.append("%s")
+                keys.append(match.group("named") or match.group("braced"))
+
+        format_string.append(template[position:].replace('%', "%%"))
+        return (''.join(format_string), tuple(keys))
+
+    @classmethod
+    def render_compiled (cls, compiled_template, kwargs):
+        format_string, keys = compiled_template
         try:
-            return string.Template(template).substitute(kwargs)
+            return format_string % tuple([kwargs[key] for key in keys])
 
         except KeyError as e:
             raise errors.SpateException(
@@ -125,14 +234,70 @@ class mustache_template_engine (_base_template_engine):
         [2] For documentation about the format of these templates, see
             http://mustache.github.io/
     """
+    _renderer = None
+
     @classmethod
-    def render (cls, template, **kwargs):
+    def compile (cls, template):
         pystache = utils.ensure_module("pystache")
+        return pystache.parse(unicode(template))
+
+    @classmethod
+    def render_compiled (cls, compiled_template, kwargs):
+        if (cls._renderer is None):
+            pystache = utils.ensure_module("pystache")
+
+            # the following overrides the HTML tag escaping performed
+            # by pystache, since it affects the quotes in job content;
+            # partials are not searched for on the filesystem either
+            cls._renderer = pystache.Renderer(
+                escape = lambda u: u,
+                search_dirs = [],
+                file_extension = False,
+                partials = {})
+
+        return cls._renderer.render(compiled_template, kwargs)
+
+class jinja2_template_engine (_base_template_engine):
+    """ Jinja2-based template engine
+
+        Arguments:
+            template (str): Jinja2-compatible template
+            **kwargs (dict, optional): variables passed to the template
+
+        Returns:
+            str: rendered job code
+
+        Notes:
+        [1] Requires the Jinja2 library to be installed; see
+            http://jinja.pocoo.org/
+        [2] For documentation about the format of these templates, see
+            http://jinja.pocoo.org/docs/templates/
+    """
+    _environment = None
+
+    @classmethod
+    def compile (cls, template):
+        if (cls._environment is None):
+            jinja2 = utils.ensure_module("jinja2", "http://jinja.pocoo.org/")
 
-        # the following overrides the HTML tag escaping performed
-        # by pystache, since it affects the quotes in job content
-        pystache.defaults.TAG_ESCAPE = lambda u: u
+            # job content is not HTML; no escaping is performed, and
+            # placeholders not provided to the template raise an error
+            cls._environment = jinja2.Environment(
+                autoescape = False,
+                optimized = True,
+                auto_reload = False,
+                keep_trailing_newline = True,
+                undefined = jinja2.StrictUndefined)
 
-        return pystache.render(template, kwargs)
+        return cls._environment.from_string(template)
+
+    @classmethod
+    def render_compiled (cls, compiled_template, kwargs):
+        try:
+            return compiled_template.render(kwargs)
+
+        except Exception as e:
+            raise errors.SpateException(
+                "Unable to render job content: %s" % e)
 
 set_template_engine(mustache_template_engine)
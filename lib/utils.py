@@ -32,12 +32,20 @@ def ensure_module (name, url = None):
 def ensure_iterable (obj):
     if (obj is None):
         return []
-    elif (is_iterable(obj)):
+    # lists and tuples, by far the most common iterables here, are tested
+    # for first as checking against collections.Iterable is much slower
+    elif (isinstance(obj, (list, tuple))) or (is_iterable(obj)):
         return obj
     else:
         return [obj]
 
 def ensure_unique (items):
+    # items are most often unique, which a set built in one go confirms
+    # faster; they are only walked to report the first duplicate found
+    items = tuple(items)
+    if (len(set(items)) == len(items)):
+        return
+
     seen = {}
     for item in items:
         if (item in seen):
@@ -51,16 +59,12 @@ def cmp_dict (dict1, dict2):
     """ Iterative comparison of two dictionaries, ignoring
         subtypes (e.g., dict and OrderedDict, or tuple and list)
     """
-    if (sorted(dict1.keys()) != sorted(dict2.keys())):
-        return False
-
-    queue = []
-    for key1, value1 in dict1.iteritems():
-        value2 = dict2[key1]
-        queue.append((value1, value2))
+    # nested values are compared using an explicit
+    # stack rather than through recursive calls
+    stack = [(dict1, dict2)]
 
-    while (len(queue) > 0):
-        value1, value2 = queue.pop(0)
+    while (len(stack) > 0):
+        value1, value2 = stack.pop()
 
         # value1 and value2 must be dictionaries (or not) together
         if (is_dict(value1) != is_dict(value2)):
@@ -68,8 +72,14 @@ def cmp_dict (dict1, dict2):
 
         # if dictionaries,
         elif (is_dict(value1)):
-            # their content is iteratively compared
-            return cmp_dict(dict1[key1], dict2[key1])
+            # they must have the same keys
+            if (sorted(value1.keys()) != sorted(value2.keys())):
+                return False
+
+            # and their content is added to the stack
+            for (key, value) in value1.iteritems():
+                stack.append((value, value2[key]))
+            continue
 
         # value1 and value2 must be iterables (or not) together
         if (is_iterable(value1) != is_iterable(value2)):
@@ -81,8 +91,8 @@ def cmp_dict (dict1, dict2):
             if (len(value1) != len(value2)):
                 return False
 
-            # their content is added to the queue
-            queue.extend(zip(value1, value2))
+            # their content is added to the stack
+            stack.extend(zip(value1, value2))
             continue
 
         # value1 and value2 must be equal
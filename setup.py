@@ -28,7 +28,6 @@ setuptools.setup(
     install_requires = [
         "colorama",
         "enum34",
-        "networkx",
         "pystache",
         "pyyaml"],
 
@@ -117,6 +117,44 @@ class DependenciesResolutionTests (unittest.TestCase):
         self.assertEqual(workflow.number_of_jobs, 2)
         self.assertEqual(workflow.number_of_paths, 3)
 
+    def test_dag_enforcement_in_batch (self):
+        workflow = spate.new_workflow()
+
+        # all files used for testing should not exist already
+        tf = TemporaryFiles()
+        _ = lambda path: tf.tmp(path, wanted = False)
+
+        workflow.add_job(_("a"), _("b"), name = "dummy-1")
+
+        # cycles created by a set of jobs should be detected as well
+        with self.assertRaises(spate.SpateException):
+            workflow.add_jobs((
+                ((_("b"), _("e")), _("c"), None, "dummy-2", None),
+                (_("c"), _("d"), None, "dummy-3", None),
+                (_("d"), _("e"), None, "dummy-4", None)))
+
+        # the whole set of jobs should have been removed
+        self.assertTrue("dummy-1" in workflow)
+        self.assertFalse("dummy-2" in workflow)
+        self.assertFalse("dummy-3" in workflow)
+        self.assertFalse("dummy-4" in workflow)
+
+        self.assertEqual(workflow.number_of_jobs, 1)
+        self.assertEqual(workflow.number_of_paths, 2)
+
+        # cycles are not detected when adding jobs if not requested,
+        # but are detected as soon as jobs need to be sorted
+        workflow.add_jobs((
+            ((_("b"), _("e")), _("c"), None, "dummy-2", None),
+            (_("c"), _("d"), None, "dummy-3", None),
+            (_("d"), _("e"), None, "dummy-4", None)),
+            check_cycles = False)
+
+        self.assertEqual(workflow.number_of_jobs, 4)
+
+        with self.assertRaises(spate.SpateException):
+            list(workflow.list_jobs())
+
     def test_predecessors_and_successors (self):
         workflow = spate.new_workflow()
 
@@ -275,5 +313,25 @@ class DependenciesResolutionTests (unittest.TestCase):
 
             self.assertEqual(sorted(job_names), sorted(level_to_jobs[level]))
 
+            # retrieving paths modification time lazily changes nothing
+            self.assertEqual(list(workflow.list_jobs(
+                outdated_only = True, with_descendants = False,
+                lazy_mtime = True)), job_names)
+
+            # neither does retrieving them with several threads
+            self.assertEqual(list(workflow.list_jobs(
+                outdated_only = True, with_descendants = False,
+                threads = 4)), job_names)
+
+            # neither does sharing paths modification time between calls
+            mtime_cache = {}
+            for lazy_mtime in (False, True):
+                self.assertEqual(list(workflow.list_jobs(
+                    outdated_only = True, with_descendants = False,
+                    lazy_mtime = lazy_mtime, mtime_cache = mtime_cache)),
+                    job_names)
+
+            self.assertEqual(len(mtime_cache), workflow.number_of_paths)
+
 if (__name__ == "__main__"):
     unittest.main()
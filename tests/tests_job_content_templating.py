@@ -13,6 +13,12 @@ _template_engines = (
     spate.string_template_engine,
     spate.mustache_template_engine)
 
+try:
+    import jinja2
+    _template_engines += (spate.jinja2_template_engine,)
+except ImportError:
+    pass
+
 def _dummy_content (engine):
     if (engine == spate.string_template_engine):
         return """\
@@ -34,6 +40,16 @@ def _dummy_content (engine):
             global_variable: {{global_variable}}
         """
 
+    if (engine == spate.jinja2_template_engine):
+        return """\
+            INPUTS: {{ INPUTS|join(' ') }} ({{ INPUTN }})
+            OUTPUTS: {{ OUTPUTS|join(' ') }} ({{ OUTPUTN }})
+            variable_1: "{{ variable_1 }}"
+            variable_2: {{ variable_2 }}
+            variable_3: {{ variable_3 }}
+            global_variable: {{ global_variable }}
+        """
+
 def _dummy_workflow (content):
     workflow = spate.new_workflow("dummy-workflow")
 
@@ -89,5 +105,53 @@ class JobsContentTemplatingTests (unittest.TestCase):
                 expected_content,
                 spate.render_job_content(workflow, name, template_engine)))
 
+    def test_shared_content_templating (self):
+        # jobs sharing the same content must still be rendered
+        # with their own paths and variables, and without escaping
+        for template_engine in _template_engines:
+            workflow = spate.new_workflow()
+            content = _dummy_content(template_engine)
+
+            for n in range(2):
+                workflow.add_job(
+                    inputs = ("a%d" % n, "b%d" % n),
+                    outputs = ("c%d" % n, "d%d" % n),
+                    content = content,
+                    name = "dummy-job-name-%d" % n,
+                    variable_1 = "'%d'" % n,
+                    variable_2 = n,
+                    variable_3 = "<%d>" % n,
+                    global_variable = False)
+
+            for n in range(2):
+                expected_content = """
+                    INPUTS: a%(n)d b%(n)d (2)
+                    OUTPUTS: c%(n)d d%(n)d (2)
+                    variable_1: "'%(n)d'"
+                    variable_2: %(n)d
+                    variable_3: <%(n)d>
+                    global_variable: False
+                    """ % {"n": n}
+
+                self.assertTrue(_is_same_content(
+                    expected_content,
+                    spate.render_job_content(workflow,
+                        "dummy-job-name-%d" % n, template_engine)))
+
+    def test_content_compilation (self):
+        workflow = spate.new_workflow()
+        workflow.add_job("a", "b", "{{INPUT}} {{OUTPUT}}", "valid-1")
+        workflow.add_job("b", "c", "{{INPUT}} {{OUTPUT}}", "valid-2")
+
+        self.assertEqual(workflow.compile_job_contents(
+            template_engine = spate.mustache_template_engine), 1)
+
+        # invalid contents are reported when compiled
+        workflow.add_job("c", "d", "{{#INPUTS}}{{/OUTPUTS}}", "invalid")
+
+        with self.assertRaises(spate.SpateException):
+            workflow.compile_job_contents(
+                template_engine = spate.mustache_template_engine)
+
 if (__name__ == "__main__"):
     unittest.main()
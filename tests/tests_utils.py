@@ -0,0 +1,60 @@
+"""
+Test of utility functions
+"""
+
+import spate
+
+import collections
+import unittest
+
+class UtilsTests (unittest.TestCase):
+
+    def test_cmp_dict (self):
+        cmp_dict = spate.utils.cmp_dict
+
+        self.assertTrue(cmp_dict({}, {}))
+        self.assertTrue(cmp_dict({"a": 1, "b": "x"}, {"b": "x", "a": 1}))
+        self.assertFalse(cmp_dict({"a": 1}, {"a": 2}))
+        self.assertFalse(cmp_dict({"a": 1}, {"a": 1, "b": 2}))
+
+        # subtypes are ignored
+        self.assertTrue(cmp_dict(
+            collections.OrderedDict([("a", (1, 2))]), {"a": [1, 2]}))
+
+        # strings are compared as a whole, not as iterables
+        self.assertFalse(cmp_dict({"a": "xy"}, {"a": ["x", "y"]}))
+
+    def test_cmp_dict_with_nested_values (self):
+        cmp_dict = spate.utils.cmp_dict
+
+        value = lambda: {
+            "a": {"b": {"c": [1, {"d": (2, 3)}]}},
+            "e": [[4, 5], {"f": None}]}
+
+        self.assertTrue(cmp_dict(value(), value()))
+
+        # differences are found at any depth, and whatever
+        # the number of nested values compared before them
+        value_ = value()
+        value_["a"]["b"]["c"][1]["d"] = (2, 4)
+        self.assertFalse(cmp_dict(value(), value_))
+
+        value_ = value()
+        value_["e"][1]["f"] = 0
+        self.assertFalse(cmp_dict(value(), value_))
+
+        value_ = value()
+        value_["e"][0].append(6)
+        self.assertFalse(cmp_dict(value(), value_))
+
+        value_ = value()
+        value_["a"]["b"]["g"] = 7
+        self.assertFalse(cmp_dict(value(), value_))
+
+        # dictionaries and lists are not interchangeable
+        value_ = value()
+        value_["e"][1] = ["f"]
+        self.assertFalse(cmp_dict(value(), value_))
+
+if (__name__ == "__main__"):
+    unittest.main()
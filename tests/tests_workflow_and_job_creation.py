@@ -1,14 +1,12 @@
 """
 Test of basic workflow and job creation features
-
-TODO: Add a test for workflow union
-TODO: Add a test for workflow comparison
 """
 
 import spate
 
 import unittest
 import itertools
+import pickle
 
 class WorkflowCreationTests (unittest.TestCase):
 
@@ -266,5 +264,86 @@ class WorkflowCreationTests (unittest.TestCase):
         workflow.add_job("c", "d", name = "dummy-job-name-2")
         self.assertEqual(workflow.number_of_jobs, 2)
 
+        # default job names skip over names already taken
+        workflow.add_job("e", "f", name = "JOB_4")
+        self.assertEqual(workflow.add_job("g", "h"), "JOB_5")
+
+    def test_workflow_comparison (self):
+        def dummy_workflow ():
+            workflow = spate.new_workflow("dummy-workflow")
+            workflow.add_job("a", "b", "content-1", name = "dummy-job-1",
+                x = 1, y = [2, 3])
+            workflow.add_job("b", "c", "content-2", name = "dummy-job-2")
+            return workflow
+
+        workflow_a, workflow_b = dummy_workflow(), dummy_workflow()
+        self.assertEqual(workflow_a, workflow_b)
+
+        # any change in content or keyword arguments is detected,
+        # even after both workflows have already been compared
+        workflow_b.set_job_content("dummy-job-2", "content-3")
+        self.assertNotEqual(workflow_a, workflow_b)
+
+        workflow_b.set_job_content("dummy-job-2", "content-2")
+        self.assertEqual(workflow_a, workflow_b)
+
+        workflow_b.set_job_kwarg("dummy-job-1", "x", 2)
+        self.assertNotEqual(workflow_a, workflow_b)
+
+        workflow_b.del_job_kwarg("dummy-job-1", "x")
+        workflow_b.set_job_kwarg("dummy-job-1", "x", 1)
+        self.assertEqual(workflow_a, workflow_b)
+
+        workflow_b.set_job_kwarg("dummy-job-1", "y", [2, 4])
+        self.assertNotEqual(workflow_a, workflow_b)
+
+        # values compared by value but hashed by identity
+        class value (object):
+            def __init__ (self, x):
+                self.x = x
+
+            def __eq__ (self, obj):
+                return (self.x == obj.x)
+
+        workflow_a.set_job_kwarg("dummy-job-2", "z", value(1))
+        workflow_b.set_job_kwarg("dummy-job-1", "y", [2, 3])
+        workflow_b.set_job_kwarg("dummy-job-2", "z", value(1))
+        self.assertEqual(workflow_a, workflow_b)
+
+    def test_workflow_union (self):
+        workflow_a = spate.new_workflow("a")
+        workflow_a.add_job("x", "y", "content-1", name = "job", k = 1)
+
+        workflow_b = spate.new_workflow("b")
+        workflow_b.add_job("y", "z", "content-2", name = "job")
+
+        workflow = workflow_a + workflow_b
+        self.assertEqual(workflow.name, "a+b")
+        self.assertEqual(workflow.number_of_jobs, 2)
+        self.assertEqual(workflow.number_of_paths, 3)
+
+        # jobs are renamed after their workflow, and keep their content
+        self.assertEqual(workflow.get_job_content("a:job"), "content-1")
+        self.assertEqual(workflow.get_job_kwargs("a:job"), {"k": 1})
+        self.assertEqual(workflow.get_job_content("b:job"), "content-2")
+        self.assertEqual(workflow.get_job_predecessors("b:job"), ("a:job",))
+
+        # a workflow cannot be merged with itself
+        with self.assertRaises(spate.SpateException):
+            workflow_a + workflow_a
+
+    def test_workflow_pickling (self):
+        workflow = spate.new_workflow("dummy-workflow")
+        workflow.add_job("a", "b", "content-1", name = "dummy-job-1", x = 1)
+        workflow.add_job("b", "c", "content-2", name = "dummy-job-2")
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            workflow_ = pickle.loads(pickle.dumps(workflow, protocol))
+            self.assertEqual(workflow_, workflow)
+            self.assertEqual(workflow_.name, "dummy-workflow")
+            self.assertEqual(
+                workflow_.get_job_predecessors("dummy-job-2"),
+                ("dummy-job-1",))
+
 if (__name__ == "__main__"):
     unittest.main()
@@ -7,6 +7,8 @@ TODO: add test for to_slurm()
 import spate
 
 import os
+import json
+import shutil
 import itertools
 import unittest
 import tempfile
@@ -77,6 +79,18 @@ class IOTests (unittest.TestCase):
 
             self.assertEqual(workflow, workflow_)
 
+    def test_save_as_json (self):
+        # the JSON document is streamed, but must be identical
+        # to that obtained by serializing the whole document
+        for workflow in (_dummy_workflow(), spate.new_workflow("empty")):
+            target = StringIO.StringIO()
+            spate.save(workflow, target, outdated_only = False)
+
+            self.assertEqual(target.getvalue(), json.dumps(
+                spate.to_json(workflow, outdated_only = False),
+                indent = 4,
+                separators = (',', ': ')))
+
     def test_echo (self):
         EXPECTED_OUTPUT = """\
             < a
@@ -121,6 +135,25 @@ class IOTests (unittest.TestCase):
         self.assertTrue(_is_same_content(
             EXPECTED_OUTPUT, target.getvalue()))
 
+    def test_export_to_named_shell_script (self):
+        workflow = _dummy_workflow()
+        target_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, target_dir)
+        target = os.path.join(target_dir, "spate_test.sh")
+
+        spate.to_shell_script(workflow, target)
+        self.assertEqual(os.stat(target).st_mode & 0777, 0755)
+
+        # an unchanged script must not be rewritten
+        os.utime(target, (0, 0))
+        spate.to_shell_script(workflow, target)
+        self.assertEqual(os.path.getmtime(target), 0)
+
+        # while a modified one must
+        workflow.set_job_content("dummy-job-name-1", "other-content")
+        spate.to_shell_script(workflow, target)
+        self.assertNotEqual(os.path.getmtime(target), 0)
+
     def test_export_to_makefile (self):
         EXPECTED_OUTPUT = """\
             SHELL := /bin/bash
@@ -145,6 +178,18 @@ class IOTests (unittest.TestCase):
         self.assertTrue(_is_same_content(
             EXPECTED_OUTPUT, target.getvalue()))
 
+    def test_export_of_non_ascii_content (self):
+        workflow = spate.new_workflow("dummy-workflow")
+        workflow.add_job("a", "b", u"caf\xe9", name = "dummy-job-name-1")
+
+        target = StringIO.StringIO()
+        spate.to_makefile(workflow, target)
+        self.assertTrue(u"@caf\xe9" in target.getvalue())
+
+        target = StringIO.StringIO()
+        spate.to_shell_script(workflow, target)
+        self.assertTrue(u"caf\xe9" in target.getvalue())
+
     def test_export_to_drake (self):
         EXPECTED_OUTPUT = """\
             ; dummy-job-name-1